@@ -6,8 +6,10 @@ of HOT's Tasking Manager.
 """
 
 
+import json
+
 from sqlalchemy import (Column, Integer, String, Float,
-                        ForeignKey)
+                        ForeignKey, UniqueConstraint)
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
 
@@ -44,6 +46,10 @@ class Project(Base):
     building_tiles = relationship(
         "TilePredBA", back_populates="project")
 
+    # Add a relationship with the published task annotation class
+    task_annotations = relationship(
+        "TaskAnnotationBA", back_populates="project")
+
     def __repr__(self):
         """Define string representation."""
         return "<Project(TM index={}, md5_hash={}, {} tiles>".format(
@@ -85,6 +91,42 @@ class TilePredBA(Base):
                     self.building_area_ml, self.building_area_osm)
 
 
+class TaskAnnotationBA(Base):
+    """Task building area annotation as last published to TM
+
+    Attributes
+    ----------
+    id: int
+        The annotation objects UID for the relational DB
+    project_id: int
+        Project ID keyed to the project table
+    task_id: int
+        ID of the task within the TM project
+    building_area_ml: float
+        Total building area for a task last sent as the ML estimate
+    building_area_osm: float
+        Total building area for a task last sent as mapped in OSM
+    """
+
+    __tablename__ = 'task_annotation_buildings'
+    __table_args__ = (UniqueConstraint('project_id', 'task_id'),)
+    id = Column(Integer, primary_key=True)
+    project_id = Column(Integer, ForeignKey('ml_projects.id'))
+    task_id = Column(Integer)
+    building_area_ml = Column(Float)
+    building_area_osm = Column(Float)
+
+    # Add a relationship with the project class
+    project = relationship('Project', back_populates='task_annotations')
+
+    def __repr__(self):
+        """Define string representation."""
+        return ("<TaskAnnotationBA(Project={}, Task ID={} "
+                "Building Area ML={}, Building Area OSM={}>").format(
+                    self.project.tm_index, self.task_id,
+                    self.building_area_ml, self.building_area_osm)
+
+
 def get_total_tiles_building_area(tile_ind_list, session):
     """Get total area of all tile indices specified in a list.
 
@@ -112,6 +154,33 @@ def get_total_tiles_building_area(tile_ind_list, session):
     return total_area_ml, total_area_osm
 
 
+def get_task_building_area(task, session):
+    """Get total building area of all max zoom tiles underlying a TM task.
+
+    Parameters
+    ----------
+    task: dict
+        geojson feature of a TM task with `taskX`, `taskY`, and `taskZoom`
+        properties
+    session: sqlalchemy.orm.session.Session
+        Handle to database
+
+    Returns
+    -------
+    area_ml: float
+        Sum of predicted building area for the task
+    area_osm: float
+        Sum of mapped building area in OSM for the task
+    """
+
+    tile_dict = dict(x=task['properties']['taskX'],
+                     y=task['properties']['taskY'],
+                     z=task['properties']['taskZoom'])
+    child_tiles = get_tile_pyramid(tile_dict, max_zoom=18)
+
+    return get_total_tiles_building_area(child_tiles, session)
+
+
 def augment_geojson_building_area(project, session):
     """Add building area information to each tile in a geojson dict.
 
@@ -127,12 +196,7 @@ def augment_geojson_building_area(project, session):
     for ti, task in enumerate(project['tasks']['features']):
 
         # Get total area
-        tile_dict = dict(x=task['properties']['taskX'],
-                         y=task['properties']['taskY'],
-                         z=task['properties']['taskZoom'])
-        child_tiles = get_tile_pyramid(tile_dict, max_zoom=18)
-
-        area_ml, area_osm = get_total_tiles_building_area(child_tiles, session)
+        area_ml, area_osm = get_task_building_area(task, session)
 
         # Add information to geojson
         task['properties']['building_area_ml_pred'] = area_ml
@@ -143,6 +207,99 @@ def augment_geojson_building_area(project, session):
     return project
 
 
+def get_task_annotation_deltas(proj_id, tasks, session, tolerance=0.,
+                               annotation_source='ml_tm_utils_pub',
+                               annotation_markdown=''):
+    """Yield building area annotations only for tasks that changed.
+
+    Values are compared against the last published annotations stored in the
+    database. Stored values are updated in the session as each annotation is
+    yielded, so commit the session only once TM has accepted the payload (and
+    roll it back otherwise).
+
+    Parameters
+    ----------
+    proj_id: int
+        TM Project ID corresponding to database entry
+    tasks: iterable of dict
+        geojson features of the TM tasks (e.g., `project['tasks']['features']`)
+    session: sqlalchemy.orm.session.Session
+        Handle to database
+    tolerance: float
+        Absolute change in building area (for either metric) that must be
+        exceeded for a task to be included. Tasks never published before are
+        always included.
+    annotation_source: str
+        Source of the annotation
+    annotation_markdown: str
+        Markdown to display alongside the annotation in TM
+
+    Yields
+    ------
+    annotation: dict
+        Task annotation with `taskId`, `annotationSource`,
+        `annotationMarkdown`, and `properties` keys
+    """
+
+    # Written so that NaN is rejected too
+    if not tolerance >= 0:
+        raise ValueError('tolerance must be non-negative, got {}'.format(
+            tolerance))
+
+    project = session.query(Project).filter(
+        Project.tm_index == proj_id).one()
+    published = {annotation.task_id: annotation
+                 for annotation in project.task_annotations}
+
+    for task in tasks:
+        task_id = task['properties']['taskId']
+        area_ml, area_osm = get_task_building_area(task, session)
+
+        # Skip tasks whose metrics haven't moved beyond the tolerance
+        annotation = published.get(task_id)
+        if annotation is None:
+            annotation = TaskAnnotationBA(task_id=task_id, project=project)
+            session.add(annotation)
+            published[task_id] = annotation
+        elif (abs(area_ml - annotation.building_area_ml) <= tolerance and
+              abs(area_osm - annotation.building_area_osm) <= tolerance):
+            continue
+
+        annotation.building_area_ml = area_ml
+        annotation.building_area_osm = area_osm
+
+        yield dict(taskId=task_id,
+                   annotationSource=annotation_source,
+                   annotationMarkdown=annotation_markdown,
+                   properties=dict(building_area_ml_pred=area_ml,
+                                   building_area_osm=area_osm))
+
+
+def stream_task_annotations_json(proj_id, annotations):
+    """Yield a Task Annotations API JSON payload in chunks.
+
+    The annotation type is not part of the payload; it belongs in the request
+    URL (`/projects/{id}/annotations/{type}/`).
+
+    Parameters
+    ----------
+    proj_id: int
+        TM Project ID the annotations belong to
+    annotations: iterable of dict
+        Task annotations (e.g., from `get_task_annotation_deltas`)
+
+    Yields
+    ------
+    chunk: str
+        Piece of the JSON payload. Joining all chunks gives the full payload.
+    """
+
+    yield '{{"projectId": {}, "tasks": ['.format(json.dumps(proj_id))
+    for ai, annotation in enumerate(annotations):
+        yield (', ' if ai else '') + json.dumps(annotation)
+    yield ']}'
+
+
 def update_db_project(proj_id, geojson, geojson_hash, session):
     """Update a project geojson and hash
 
@@ -17,6 +17,8 @@ from ml_tm_utils_pub.utils_geodata import (get_tile_pyramid, _get_md5_checksum,
 from ml_tm_utils_pub.utils_database import (Project, TilePredBA,
                                      update_db_project,
                                      get_total_tiles_building_area,
+                                     get_task_annotation_deltas,
+                                     stream_task_annotations_json,
                                      Base)
 
 testpath = os.path.dirname(__file__)
@@ -167,3 +169,69 @@ class DatabaseTest(unittest.TestCase):
         new_project = session.query(Project).filter(Project.tm_index == 26).one()
         new_hash = new_project.md5_hash
         self.assertNotEqual(new_hash, orig_hash)
+
+    def test_task_annotation_deltas(self):
+        """Check only changed task annotations are emitted."""
+
+        engine = create_engine('sqlite:///:memory:', echo=False)
+        Base.metadata.create_all(engine)
+        session = sessionmaker(bind=engine)()
+
+        # One predicted tile underneath each of three neighboring z17 tasks
+        proj_1 = Project(tm_index=26, json_geometry='', md5_hash='')
+        tile_preds = [TilePredBA(tile_index='18-{}-139026'.format(2 * x),
+                                 building_area_ml=5., building_area_osm=2.,
+                                 project=proj_1)
+                      for x in (104400, 104401, 104402)]
+        session.add(proj_1)
+        session.add_all(tile_preds)
+        session.commit()
+
+        tasks = [dict(properties=dict(taskId=task_id, taskX=x, taskY=69513,
+                                      taskZoom=17))
+                 for task_id, x in [(1, 104400), (2, 104401), (3, 104402)]]
+
+        # First publication includes every task; a repeated taskId is only
+        #     stored once and isn't emitted twice
+        deltas = list(get_task_annotation_deltas(
+            26, tasks[:2] + tasks[:1], session))
+        session.commit()
+        self.assertEqual([delta['taskId'] for delta in deltas], [1, 2])
+        self.assertEqual(len(proj_1.task_annotations), 2)
+
+        # Full task object matches the Task Annotations API shape
+        self.assertEqual(deltas[0], dict(
+            taskId=1, annotationSource='ml_tm_utils_pub',
+            annotationMarkdown='',
+            properties=dict(building_area_ml_pred=5., building_area_osm=2.)))
+
+        # Nothing changed, so nothing is emitted
+        self.assertEqual(
+            list(get_task_annotation_deltas(26, tasks[:2], session)), [])
+
+        # Changes within tolerance are skipped
+        tile_preds[1].building_area_ml = 5.5
+        session.commit()
+        self.assertEqual(list(get_task_annotation_deltas(
+            26, tasks[:2], session, tolerance=1.)), [])
+
+        # Changed and new tasks are emitted, unchanged ones are skipped
+        deltas = list(get_task_annotation_deltas(
+            26, tasks, session, annotation_source='model_v1',
+            annotation_markdown='Building area'))
+        self.assertEqual([delta['taskId'] for delta in deltas], [2, 3])
+        self.assertEqual(deltas[0]['properties']['building_area_ml_pred'], 5.5)
+        self.assertEqual(deltas[1]['annotationSource'], 'model_v1')
+        self.assertEqual(deltas[1]['annotationMarkdown'], 'Building area')
+
+        # Streamed payload with several tasks is valid JSON
+        payload = json.loads(''.join(stream_task_annotations_json(26, deltas)))
+        self.assertEqual(payload, dict(projectId=26, tasks=deltas))
+        self.assertEqual(json.loads(''.join(stream_task_annotations_json(
+            26, []))), dict(projectId=26, tasks=[]))
+
+        # NaN or negative tolerances are rejected
+        for tolerance in (float('nan'), -1.):
+            with self.assertRaises(ValueError):
+                list(get_task_annotation_deltas(26, tasks, session,
+                                                tolerance=tolerance))